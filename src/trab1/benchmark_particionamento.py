@@ -0,0 +1,84 @@
+import os
+import sys
+import time
+import numpy as np
+from utils.estrutura import WingedEdgeMesh
+from utils.subdivisao import subdividir_catmull_clark
+from utils.particionamento import ExecutorParticionado
+from transformacoes import aplicar_transformacao, criar_matriz_transformacao
+
+def cronometrar(funcao, repeticoes=3):
+    # Melhor tempo entre as repetições (em segundos)
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+MATRIZ = criar_matriz_transformacao([('rotacao_y', 30), ('escala', 2), ('translacao', 1, 2, 3)])
+
+def medir_serial(mesh):
+    # Código serial existente que o executor substitui, com a mesma saída: array de
+    # vértices já convertido e dict face_id -> set totalmente materializado
+    vertices = np.array([mesh.vertices[i].position for i in sorted(mesh.vertices)], dtype=float)
+    return {
+        'aplicar_transformacao': cronometrar(lambda: aplicar_transformacao(vertices, MATRIZ)),
+        'adjacent_faces_lote': cronometrar(lambda: {f: mesh.adjacent_faces(f) for f in mesh.faces}),
+    }
+
+def materializar(resultado):
+    # ResultadoCSR é preguiçoso: criar todos os sets para comparar com o serial
+    return {chave: resultado[chave] for chave in resultado}
+
+def medir(mesh, processos, metodo):
+    matriz = MATRIZ
+    inicio = time.perf_counter()
+    with ExecutorParticionado(mesh, processos=processos, metodo=metodo) as executor:
+        preparo = time.perf_counter() - inicio
+        tempos = {
+            'aplicar_transformacao': cronometrar(lambda: executor.aplicar_transformacao(matriz)),
+            'atributos_faces': cronometrar(executor.atributos_faces),
+            'normais_vertices': cronometrar(executor.normais_vertices),
+            'adjacent_faces_lote': cronometrar(lambda: materializar(executor.adjacent_faces_lote())),
+        }
+    return preparo, tempos
+
+def main():
+    """
+    Mede o speedup do ExecutorParticionado em malhas sintéticas (cube.obj subdividido)
+
+    Uso: python benchmark_particionamento.py [niveis_max] [regioes|espacial] [processos,...]
+
+    Sem a lista de processos, usa 1, 2, 4, ... até o número de núcleos disponíveis.
+    """
+    niveis_max = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    metodo = sys.argv[2] if len(sys.argv) > 2 else 'regioes'
+    nucleos = os.cpu_count() or 1
+    if len(sys.argv) > 3:
+        lista_processos = sorted({1} | {int(p) for p in sys.argv[3].split(',')})
+    else:
+        lista_processos = sorted({1, 2, 4, 8, 16, 32, nucleos} & set(range(1, nucleos + 1)))
+
+    base = WingedEdgeMesh()
+    base.load_obj(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cube.obj'))
+    print(f"Núcleos disponíveis: {nucleos} | método: {metodo}")
+
+    for niveis in range(niveis_max - 2, niveis_max + 1):
+        mesh = subdividir_catmull_clark(base, niveis)
+        print(f"\n=== cube.obj, Catmull-Clark nível {niveis}: {len(mesh.vertices)} vértices, {len(mesh.faces)} faces ===")
+        serial = medir_serial(mesh)
+        print("serial (métodos existentes)")
+        for nome, t in serial.items():
+            print(f"  {nome:22s} {t * 1000:9.2f} ms")
+        referencia = None
+        for processos in lista_processos:
+            preparo, tempos = medir(mesh, processos, metodo)
+            referencia = referencia or tempos
+            print(f"processos={processos:2d} (preparo {preparo:.3f}s)")
+            for nome, t in tempos.items():
+                contra_serial = f"   vs serial {serial[nome] / t:6.2f}x" if nome in serial else ""
+                print(f"  {nome:22s} {t * 1000:9.2f} ms   speedup {referencia[nome] / t:5.2f}x{contra_serial}")
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import sys
 from utils.estrutura import WingedEdgeMesh
 from utils.visualizador import visualizar_mesh
 from transformacoes import processar_transformacoes_interativo, salvar_mesh_obj
+from utils.triangulacao import salvar_triangulacao_binaria
 import matplotlib.pyplot as plt
 
 def main():
@@ -30,6 +31,7 @@ def main():
         print("5: Faces adjacentes a uma face")
         print("6: Visualizar malha")
         print("7: Transformações")
+        print("8: Triangular e exportar buffers binários")
         print("0: Sair")
 
         opcao = input("Opção: ")
@@ -114,6 +116,16 @@ def main():
                     nome_arquivo = input("📝 Nome do arquivo (sem extensão): ")
                     salvar_mesh_obj(mesh_transformada, f"{nome_arquivo}.obj")
 
+        elif opcao == '8':
+            try:
+                triangulacao = mesh.triangular()
+                print(f"{len(triangulacao['indices'])} triângulos, {len(triangulacao['vertices'])} vértices")
+                prefixo = input("📝 Prefixo dos arquivos: ")
+                for nome_arquivo in salvar_triangulacao_binaria(triangulacao, prefixo):
+                    print(f"✅ Buffer salvo em: {nome_arquivo}")
+            except Exception as e:
+                print(f"Erro ao triangular: {e}")
+
 # ADICIONE ESTA FUNÇÃO SIMPLES TAMBÉM NO main.py:
 def visualizar_comparacao_simples(mesh_original, mesh_transformada, show_labels):
     """Visualiza mesh original e transformada em janelas separadas"""
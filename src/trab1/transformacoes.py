@@ -177,30 +177,119 @@ def decompor_matriz_transformacao(matriz):
     """
     Decompoe uma matriz de transformação 4x4 em seus componentes básicos
     
+    Args:
+        matriz: Matriz 4x4 de transformação
+        
+    Returns:
+        dict: translacao, escala, cisalhamento, matriz_rotacao, quaternio e reflexao
+              (ver decompor_matrizes_transformacao)
     """
-    # Extrair translação
-    translacao = matriz[:3, 3]
-    
-    # Extrair matriz 3x3 superior esquerda
-    matriz_3x3 = matriz[:3, :3]
+    componentes = decompor_matrizes_transformacao(np.asarray(matriz)[np.newaxis])
+    return {chave: valor[0] for chave, valor in componentes.items()}
+
+def decompor_matrizes_transformacao(matrizes):
+    """
+    Decompoe um lote de matrizes 4x4 em translação, rotação, escala e cisalhamento
     
-    # Extrair escalas (norma de cada coluna)
-    escala_x = np.linalg.norm(matriz_3x3[:, 0])
-    escala_y = np.linalg.norm(matriz_3x3[:, 1])
-    escala_z = np.linalg.norm(matriz_3x3[:, 2])
+    A parte 3x3 de cada matriz é fatorada por QR como M = R @ C @ S, onde R é uma
+    rotação própria, C é um cisalhamento triangular superior com diagonal unitária
+    (planos 'xy', 'xz' e 'yz', como em criar_matriz_cisalhamento) e S é a escala.
+    Quando a matriz inclui uma reflexão (determinante negativo) o eixo X é espelhado,
+    ficando com escala negativa. Escalas nulas resultam em cisalhamento zero no eixo
+    correspondente, sem divisão por zero.
     
-    # Remover escala para obter matriz de rotação
-    matriz_rotacao = matriz_3x3.copy()
-    matriz_rotacao[:, 0] /= escala_x
-    matriz_rotacao[:, 1] /= escala_y
-    matriz_rotacao[:, 2] /= escala_z
+    Args:
+        matrizes: Array (K, 4, 4) de matrizes de transformação
+        
+    Returns:
+        dict: Arrays com K entradas cada
+            - 'translacao': (K, 3)
+            - 'escala': (K, 3)
+            - 'cisalhamento': (K, 3) com os fatores (xy, xz, yz)
+            - 'matriz_rotacao': (K, 3, 3)
+            - 'quaternio': (K, 4) no formato (w, x, y, z)
+            - 'reflexao': (K,) booleano
+    """
+    matrizes = np.asarray(matrizes, dtype=float)
+    if matrizes.ndim != 3 or matrizes.shape[1:] != (4, 4):
+        raise ValueError(f"Esperado array de formato (K, 4, 4), recebido {matrizes.shape}")
+    
+    translacao = matrizes[:, :3, 3].copy()
+    matriz_3x3 = matrizes[:, :3, :3]
+    
+    # Fatoração QR em lote: M = Q @ U, com U triangular superior
+    q, u = np.linalg.qr(matriz_3x3)
+    
+    # Forçar diagonal de U não negativa (a fatoração QR é única a menos de sinais)
+    sinais = np.where(np.diagonal(u, axis1=1, axis2=2) < 0, -1.0, 1.0)
+    q = q * sinais[:, np.newaxis, :]
+    u = u * sinais[:, :, np.newaxis]
+    
+    # Reflexão: Q com determinante -1 vira rotação própria espelhando o eixo X
+    reflexao = np.linalg.det(q) < 0
+    espelho = np.where(reflexao, -1.0, 1.0)
+    q[:, :, 0] *= espelho[:, np.newaxis]
+    u[:, 0, :] *= espelho[:, np.newaxis]
+    
+    # U = C @ S: a escala é a diagonal e o cisalhamento vem de dividir as colunas por ela
+    escala = np.diagonal(u, axis1=1, axis2=2).copy()
+    divisor = escala[:, [1, 2, 2]]
+    numerador = u[:, [0, 0, 1], [1, 2, 2]]
+    cisalhamento = np.divide(numerador, divisor, out=np.zeros_like(numerador),
+                             where=np.abs(divisor) > 1e-12)
     
     return {
         'translacao': translacao,
-        'escala': np.array([escala_x, escala_y, escala_z]),
-        'matriz_rotacao': matriz_rotacao
+        'escala': escala,
+        'cisalhamento': cisalhamento,
+        'matriz_rotacao': q,
+        'quaternio': matriz_rotacao_para_quaternio(q),
+        'reflexao': reflexao
     }
 
+def matriz_rotacao_para_quaternio(matrizes_rotacao):
+    """
+    Converte um lote de matrizes de rotação (K, 3, 3) em quatérnios unitários (K, 4)
+    
+    Usa o método de Shepperd: para cada matriz escolhe o maior entre w, x, y e z
+    como pivô, evitando a instabilidade numérica perto de rotações de 180 graus.
+    O quatérnio retornado está no formato (w, x, y, z) com w >= 0.
+    """
+    r = np.asarray(matrizes_rotacao, dtype=float)
+    m00, m11, m22 = r[:, 0, 0], r[:, 1, 1], r[:, 2, 2]
+    
+    # Quatro vezes o quadrado de cada componente
+    candidatos = np.stack([
+        1.0 + m00 + m11 + m22,
+        1.0 + m00 - m11 - m22,
+        1.0 - m00 + m11 - m22,
+        1.0 - m00 - m11 + m22,
+    ], axis=1)
+    pivo = np.argmax(candidatos, axis=1)
+    s = 2.0 * np.sqrt(np.maximum(candidatos[np.arange(len(r)), pivo], 1e-300))
+    
+    # Somas e diferenças simétricas dos elementos fora da diagonal
+    d21 = r[:, 2, 1] - r[:, 1, 2]
+    d02 = r[:, 0, 2] - r[:, 2, 0]
+    d10 = r[:, 1, 0] - r[:, 0, 1]
+    s01 = r[:, 0, 1] + r[:, 1, 0]
+    s02 = r[:, 0, 2] + r[:, 2, 0]
+    s12 = r[:, 1, 2] + r[:, 2, 1]
+    
+    quaternio = np.empty((len(r), 4))
+    opcoes = [
+        (0.25 * s, d21 / s, d02 / s, d10 / s),
+        (d21 / s, 0.25 * s, s01 / s, s02 / s),
+        (d02 / s, s01 / s, 0.25 * s, s12 / s),
+        (d10 / s, s02 / s, s12 / s, 0.25 * s),
+    ]
+    for componente in range(4):
+        quaternio[:, componente] = np.choose(pivo, [opcao[componente] for opcao in opcoes])
+    
+    # Hemisfério canônico (q e -q representam a mesma rotação)
+    quaternio *= np.where(quaternio[:, 0] < 0, -1.0, 1.0)[:, np.newaxis]
+    return quaternio
+
 def aplicar_transformacoes_mesh(mesh, transformacoes):
     """
     Aplica transformações aos vértices da mesh e retorna uma nova mesh transformada
@@ -233,9 +322,35 @@ def aplicar_transformacoes_mesh(mesh, transformacoes):
     # Atualizar posições dos vértices
     for i, v_id in enumerate(vertices_ids):
         mesh_transformada.vertices[v_id].position = vertices_transformados[i].tolist()
+    mesh_transformada.invalidar_triangulacao()
     
     return mesh_transformada, matriz
 
+def aplicar_transformacoes_mesh_mapeada(mesh, transformacoes, diretorio_destino):
+    """
+    Versão fora de memória de aplicar_transformacoes_mesh para WingedEdgeMeshMapeada
+    
+    Os vértices são transformados bloco a bloco e gravados diretamente no arquivo de
+    posições da nova malha; a topologia é copiada da malha original.
+    
+    Args:
+        mesh: Objeto WingedEdgeMeshMapeada original
+        transformacoes: Lista de transformações a serem aplicadas
+        diretorio_destino: Diretório onde a malha transformada será gravada
+        
+    Returns:
+        tuple: (mesh_transformada, matriz_transformacao)
+    """
+    matriz = criar_matriz_transformacao(transformacoes)
+    
+    mesh_transformada, posicoes = mesh.copiar_topologia(diretorio_destino)
+    for inicio, fim in mesh.blocos(mesh.num_vertices):
+        posicoes[inicio:fim] = aplicar_transformacao(mesh.posicoes[inicio:fim], matriz)
+    posicoes.flush()
+    del posicoes
+    
+    return mesh_transformada.abrir(), matriz
+
 def menu_transformacoes():
     """
     Menu interativo para definir transformações
@@ -1,3 +1,5 @@
+from .triangulacao import triangular_mesh
+
 class Vertice:
     def __init__(self, index, position):
         self.index = index
@@ -31,6 +33,7 @@ class WingedEdgeMesh:
         self.vertices = {}  
         self.arestas = {}   # (min, max) -> Aresta (com direção)
         self.faces = {}    
+        self._triangulacao = None  # cache dos buffers de triângulos
         
      # Cria ou retorna uma aresta entre dois vértices
     def add_aresta(self, start, end):
@@ -43,6 +46,7 @@ class WingedEdgeMesh:
         with open(filename) as f:
             lines = f.readlines()
 
+        self._triangulacao = None
         face_index = 1
 
         for line in lines:
@@ -57,47 +61,62 @@ class WingedEdgeMesh:
 
             elif parts[0] == 'f':
                 indices = [int(p.split('/')[0]) for p in parts[1:]]
-                face = Face(face_index, indices)
-                self.faces[face_index] = face
-
-                n = len(indices)
-                arestas_da_face = []
-
-                # criação das arestas e associação a face (left ou right)
-                for i in range(n):
-                    v1 = indices[i]
-                    v2 = indices[(i + 1) % n]  # conecta último com o primeiro
-                    a = self.add_aresta(v1, v2)
-                    face.arestas.append(a)
-                    arestas_da_face.append((v1, v2, a))
-
-                    if (a.start == v1 and a.end == v2): # se a direção da aresta é (v1 -> v2)
-                        if a.left_face is None:
-                            a.left_face = face # associa a face atual ao lado esquerdo da aresta
-                        else:
-                            a.right_face = face
-                    else:                      
-                        if a.right_face is None:
-                            a.right_face = face
-                        else:
-                            a.left_face = face
-
-                # definir o proximo e o anterior de cada aresta
-                for i in range(n):
-                    _, _, atual = arestas_da_face[i] # usando apenas 'a'
-                    _, _, prox = arestas_da_face[(i + 1) % n]
-                    _, _, ant = arestas_da_face[(i - 1) % n]
-
-                    if atual.left_face == face: 
-                        atual.left_next = prox
-                        atual.left_prev = ant
-                    elif atual.right_face == face:
-                        atual.right_next = prox
-                        atual.right_prev = ant
-
+                self.add_face(face_index, indices)
                 face_index += 1
 
 
+    # Cria a face e associa suas arestas (left/right e next/prev)
+    def add_face(self, face_index, indices):
+        self._triangulacao = None  # faces mudaram: a triangulação em cache fica inválida
+        face = Face(face_index, indices)
+        self.faces[face_index] = face
+
+        n = len(indices)
+        arestas_da_face = []
+
+        # criação das arestas e associação a face (left ou right)
+        for i in range(n):
+            v1 = indices[i]
+            v2 = indices[(i + 1) % n]  # conecta último com o primeiro
+            a = self.add_aresta(v1, v2)
+            face.arestas.append(a)
+            arestas_da_face.append((v1, v2, a))
+
+            if (a.start == v1 and a.end == v2): # se a direção da aresta é (v1 -> v2)
+                if a.left_face is None:
+                    a.left_face = face # associa a face atual ao lado esquerdo da aresta
+                else:
+                    a.right_face = face
+            else:                      
+                if a.right_face is None:
+                    a.right_face = face
+                else:
+                    a.left_face = face
+
+        # definir o proximo e o anterior de cada aresta
+        for i in range(n):
+            _, _, atual = arestas_da_face[i] # usando apenas 'a'
+            _, _, prox = arestas_da_face[(i + 1) % n]
+            _, _, ant = arestas_da_face[(i - 1) % n]
+
+            if atual.left_face == face: 
+                atual.left_next = prox
+                atual.left_prev = ant
+            elif atual.right_face == face:
+                atual.right_next = prox
+                atual.right_prev = ant
+        return face
+
+    def triangular(self):
+        # Buffers de triângulos (float32/uint32), calculados uma vez e reaproveitados
+        if self._triangulacao is None:
+            self._triangulacao = triangular_mesh(self)
+        return self._triangulacao
+
+    def invalidar_triangulacao(self):
+        # Deve ser chamado quando posições ou faces forem alteradas
+        self._triangulacao = None
+
     def verificar_vertice(self, vertice_id):
         if vertice_id not in self.vertices:
             raise ValueError(f"Vértice {vertice_id} não encontrado.")
@@ -0,0 +1,370 @@
+import os
+import json
+import numpy as np
+from numpy.lib.format import open_memmap
+
+# Arquivos .npy que compõem uma malha mapeada em disco
+ARQUIVO_META = 'meta.json'
+ARQUIVO_POSICOES = 'posicoes.npy'            # float64 (N, 3)
+ARQUIVO_FACE_OFFSETS = 'face_offsets.npy'    # int64 (F + 1,) início de cada face em face_indices
+ARQUIVO_FACE_INDICES = 'face_indices.npy'    # int64 (soma dos tamanhos,) IDs dos vértices
+ARQUIVO_ARESTAS = 'arestas.npy'              # int64 (E, 2) chave (min, max), ordenada
+ARQUIVO_ARESTAS_DIRECAO = 'arestas_direcao.npy'  # int64 (E, 2) (start, end)
+ARQUIVO_ARESTAS_FACES = 'arestas_faces.npy'  # int64 (E, 2) (left_face, right_face), 0 = nenhuma
+
+ARQUIVOS_TOPOLOGIA = (ARQUIVO_FACE_OFFSETS, ARQUIVO_FACE_INDICES, ARQUIVO_ARESTAS,
+                      ARQUIVO_ARESTAS_DIRECAO, ARQUIVO_ARESTAS_FACES)
+
+class WingedEdgeMeshMapeada:
+    """
+    Versão fora de memória (out-of-core) da WingedEdgeMesh
+
+    Posições, faces e a tabela de arestas ficam em arquivos .npy mapeados em memória
+    dentro de `diretorio` e são paginados sob demanda. As consultas percorrem os
+    arrays em blocos de `tamanho_bloco` elementos, mantendo a memória residente limitada.
+
+    IDs de vértices e faces seguem o .obj (base 1); a linha correspondente nos arrays
+    é o ID - 1. Os ponteiros de asa (next/prev) não são armazenados: a ordem das
+    arestas de cada face já está implícita em face_indices.
+    """
+
+    def __init__(self, diretorio, tamanho_bloco=1 << 20):
+        self.diretorio = diretorio
+        self.tamanho_bloco = tamanho_bloco
+        self.posicoes = None
+        self.face_offsets = None
+        self.face_indices = None
+        self.arestas = None
+        self.arestas_direcao = None
+        self.arestas_faces = None
+
+    @property
+    def num_vertices(self):
+        return len(self.posicoes)
+
+    @property
+    def num_faces(self):
+        return len(self.face_offsets) - 1
+
+    @property
+    def num_arestas(self):
+        return len(self.arestas)
+
+    def caminho(self, nome):
+        return os.path.join(self.diretorio, nome)
+
+    def novo_memmap(self, nome, tipo, forma):
+        # Cria o arquivo do zero (remove o anterior em vez de truncá-lo no lugar)
+        caminho = self.caminho(nome)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+        return open_memmap(caminho, mode='w+', dtype=tipo, shape=forma)
+
+    def blocos(self, total):
+        # Intervalos [inicio, fim) de no máximo tamanho_bloco elementos
+        for inicio in range(0, total, self.tamanho_bloco):
+            yield inicio, min(inicio + self.tamanho_bloco, total)
+
+    def abrir(self):
+        # Abre (somente leitura) uma malha já gravada em self.diretorio
+        if not os.path.exists(self.caminho(ARQUIVO_META)):
+            raise ValueError(f"Diretório '{self.diretorio}' não contém uma malha mapeada.")
+        self.posicoes = np.load(self.caminho(ARQUIVO_POSICOES), mmap_mode='r')
+        self.face_offsets = np.load(self.caminho(ARQUIVO_FACE_OFFSETS), mmap_mode='r')
+        self.face_indices = np.load(self.caminho(ARQUIVO_FACE_INDICES), mmap_mode='r')
+        self.arestas = np.load(self.caminho(ARQUIVO_ARESTAS), mmap_mode='r')
+        self.arestas_direcao = np.load(self.caminho(ARQUIVO_ARESTAS_DIRECAO), mmap_mode='r')
+        self.arestas_faces = np.load(self.caminho(ARQUIVO_ARESTAS_FACES), mmap_mode='r')
+        return self
+
+    def salvar_meta(self, origem):
+        with open(self.caminho(ARQUIVO_META), 'w') as f:
+            json.dump({'origem': origem,
+                       'vertices': int(len(self.posicoes)),
+                       'faces': int(len(self.face_offsets) - 1),
+                       'arestas': int(len(self.arestas))}, f)
+
+    def load_obj(self, filename):
+        """
+        Converte um .obj para arquivos mapeados sem materializar a malha em memória
+
+        O arquivo é lido duas vezes: a primeira conta vértices, faces e índices para
+        dimensionar os arquivos; a segunda grava os dados bloco a bloco. Em seguida a
+        tabela de arestas é montada (ver construir_arestas).
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+
+        # Primeira passada: dimensionar os arquivos
+        num_vertices = num_faces = num_indices = 0
+        with open(filename) as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                if parts[0] == 'v':
+                    num_vertices += 1
+                elif parts[0] == 'f':
+                    num_faces += 1
+                    num_indices += len(parts) - 1
+
+        posicoes = self.novo_memmap(ARQUIVO_POSICOES, np.float64, (num_vertices, 3))
+        face_offsets = self.novo_memmap(ARQUIVO_FACE_OFFSETS, np.int64, (num_faces + 1,))
+        face_indices = self.novo_memmap(ARQUIVO_FACE_INDICES, np.int64, (num_indices,))
+
+        # Segunda passada: gravar em blocos
+        buffer_v, buffer_f, buffer_n = [], [], []
+        vertice_atual = face_atual = indice_atual = 0
+
+        def descarregar():
+            nonlocal vertice_atual, face_atual, indice_atual
+            if buffer_v:
+                posicoes[vertice_atual:vertice_atual + len(buffer_v)] = buffer_v
+                vertice_atual += len(buffer_v)
+                buffer_v.clear()
+            if buffer_n:
+                tamanhos = np.array(buffer_n, dtype=np.int64)
+                face_offsets[face_atual + 1:face_atual + 1 + len(tamanhos)] = \
+                    indice_atual + np.cumsum(tamanhos)
+                face_indices[indice_atual:indice_atual + len(buffer_f)] = buffer_f
+                face_atual += len(tamanhos)
+                indice_atual += len(buffer_f)
+                buffer_f.clear()
+                buffer_n.clear()
+
+        with open(filename) as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                if parts[0] == 'v':
+                    buffer_v.append(tuple(map(float, parts[1:4])))
+                elif parts[0] == 'f':
+                    buffer_f.extend(int(p.split('/')[0]) for p in parts[1:])
+                    buffer_n.append(len(parts) - 1)
+                if len(buffer_v) + len(buffer_f) >= self.tamanho_bloco:
+                    descarregar()
+        descarregar()
+        face_offsets[0] = 0
+
+        posicoes.flush()
+        face_offsets.flush()
+        face_indices.flush()
+        del posicoes, face_offsets, face_indices
+
+        self.posicoes = np.load(self.caminho(ARQUIVO_POSICOES), mmap_mode='r')
+        self.face_offsets = np.load(self.caminho(ARQUIVO_FACE_OFFSETS), mmap_mode='r')
+        self.face_indices = np.load(self.caminho(ARQUIVO_FACE_INDICES), mmap_mode='r')
+        self.construir_arestas()
+        self.salvar_meta(os.path.abspath(filename))
+        return self
+
+    def blocos_faces(self):
+        # Intervalos de faces inteiras cujo total de índices cabe em ~tamanho_bloco
+        inicio = 0
+        while inicio < self.num_faces:
+            limite = self.face_offsets[inicio] + self.tamanho_bloco
+            fim = int(np.searchsorted(self.face_offsets, limite, side='right')) - 1
+            fim = min(max(fim, inicio + 1), self.num_faces)
+            yield inicio, fim
+            inicio = fim
+
+    def meias_arestas(self, inicio, fim):
+        """
+        Meias-arestas (v1 -> v2) das faces [inicio, fim), na ordem do arquivo
+
+        Returns:
+            tuple: (v1, v2, face_id, ordem), onde ordem é a posição global da meia-aresta
+        """
+        offsets = np.asarray(self.face_offsets[inicio:fim + 1])
+        base = offsets[0]
+        v1 = np.asarray(self.face_indices[base:offsets[-1]])
+        tamanhos = np.diff(offsets)
+        face_id = np.repeat(np.arange(inicio + 1, fim + 1), tamanhos)
+
+        # O próximo vértice é o seguinte na face, exceto no último, que volta ao primeiro
+        proximo = np.arange(1, len(v1) + 1)
+        ultimos = offsets[1:] - base - 1
+        proximo[ultimos] = offsets[:-1] - base
+        v2 = v1[proximo]
+        return v1, v2, face_id, base + np.arange(len(v1))
+
+    def construir_arestas(self):
+        """
+        Monta a tabela de arestas ordenada por chave (min, max) com memória limitada
+
+        As meias-arestas são distribuídas em baldes pelo menor vértice (contagem e
+        depois espalhamento em arquivos temporários) e cada balde, que cabe em um
+        bloco, é ordenado e deduplicado. Como na WingedEdgeMesh, a direção da aresta é
+        a da primeira meia-aresta encontrada, a primeira face vai para left_face e a
+        segunda para right_face (em arestas não-manifold as demais faces são ignoradas).
+        """
+        num_meias = len(self.face_indices)
+        num_vertices = max(self.num_vertices, 1)
+        num_baldes = max(1, -(-num_meias // self.tamanho_bloco))
+
+        def balde(v1, v2):
+            return (np.minimum(v1, v2) - 1) * num_baldes // num_vertices
+
+        # Contagem por balde
+        contagem = np.zeros(num_baldes, dtype=np.int64)
+        for inicio, fim in self.blocos_faces():
+            v1, v2, _, _ = self.meias_arestas(inicio, fim)
+            contagem += np.bincount(balde(v1, v2), minlength=num_baldes)
+        inicio_balde = np.concatenate([[0], np.cumsum(contagem)])
+
+        # Espalhamento em arquivos temporários agrupados por balde
+        temporarios = {nome: self.novo_memmap(f'_tmp_{nome}.npy', np.int64, (num_meias,))
+                       for nome in ('v1', 'v2', 'face', 'ordem')}
+        preenchido = inicio_balde[:-1].copy()
+        for inicio, fim in self.blocos_faces():
+            v1, v2, face_id, ordem = self.meias_arestas(inicio, fim)
+            b = balde(v1, v2)
+            ordenacao = np.argsort(b, kind='stable')
+            b = b[ordenacao]
+            posicao_no_balde = np.arange(len(b)) - np.searchsorted(b, b)
+            destino = preenchido[b] + posicao_no_balde
+            for nome, valores in (('v1', v1), ('v2', v2), ('face', face_id), ('ordem', ordem)):
+                temporarios[nome][destino] = valores[ordenacao]
+            preenchido += np.bincount(b, minlength=num_baldes)
+
+        def arestas_do_balde(k):
+            inicio, fim = inicio_balde[k], inicio_balde[k + 1]
+            v1, v2, face_id, ordem = (np.asarray(temporarios[nome][inicio:fim])
+                                      for nome in ('v1', 'v2', 'face', 'ordem'))
+            chave_min, chave_max = np.minimum(v1, v2), np.maximum(v1, v2)
+            ordenacao = np.lexsort((ordem, chave_max, chave_min))
+            chave_min, chave_max = chave_min[ordenacao], chave_max[ordenacao]
+            novo = np.ones(len(ordenacao), dtype=bool)
+            novo[1:] = (chave_min[1:] != chave_min[:-1]) | (chave_max[1:] != chave_max[:-1])
+            primeiros = np.flatnonzero(novo)
+            return v1, v2, face_id, ordenacao, chave_min, chave_max, novo, primeiros
+
+        num_arestas = sum(int(np.count_nonzero(arestas_do_balde(k)[6])) for k in range(num_baldes))
+
+        arestas = self.novo_memmap(ARQUIVO_ARESTAS, np.int64, (num_arestas, 2))
+        direcao = self.novo_memmap(ARQUIVO_ARESTAS_DIRECAO, np.int64, (num_arestas, 2))
+        faces = self.novo_memmap(ARQUIVO_ARESTAS_FACES, np.int64, (num_arestas, 2))
+        atual = 0
+        for k in range(num_baldes):
+            v1, v2, face_id, ordenacao, chave_min, chave_max, novo, primeiros = arestas_do_balde(k)
+            n = len(primeiros)
+            fatia = slice(atual, atual + n)
+            arestas[fatia, 0] = chave_min[primeiros]
+            arestas[fatia, 1] = chave_max[primeiros]
+            direcao[fatia, 0] = v1[ordenacao[primeiros]]
+            direcao[fatia, 1] = v2[ordenacao[primeiros]]
+            faces[fatia, 0] = face_id[ordenacao[primeiros]]
+
+            # Segunda ocorrência (se existir) da mesma chave -> right_face
+            segundos = primeiros + 1
+            tem_segunda = segundos < len(novo)
+            tem_segunda[tem_segunda] = ~novo[segundos[tem_segunda]]
+            direita = np.zeros(n, dtype=np.int64)
+            direita[tem_segunda] = face_id[ordenacao[segundos[tem_segunda]]]
+            faces[fatia, 1] = direita
+            atual += n
+
+        for mapa in (arestas, direcao, faces):
+            mapa.flush()
+        del arestas, direcao, faces
+        for nome in list(temporarios):
+            del temporarios[nome]
+            os.remove(self.caminho(f'_tmp_{nome}.npy'))
+
+        self.arestas = np.load(self.caminho(ARQUIVO_ARESTAS), mmap_mode='r')
+        self.arestas_direcao = np.load(self.caminho(ARQUIVO_ARESTAS_DIRECAO), mmap_mode='r')
+        self.arestas_faces = np.load(self.caminho(ARQUIVO_ARESTAS_FACES), mmap_mode='r')
+
+    def indice_aresta(self, v1, v2):
+        # Busca binária da chave (min, max) na tabela ordenada; -1 se não existir
+        a, b = min(v1, v2), max(v1, v2)
+        inicio = int(np.searchsorted(self.arestas[:, 0], a, side='left'))
+        fim = int(np.searchsorted(self.arestas[:, 0], a, side='right'))
+        i = inicio + int(np.searchsorted(self.arestas[inicio:fim, 1], b))
+        if i < fim and self.arestas[i, 1] == b:
+            return i
+        return -1
+
+    def verificar_vertice(self, vertice_id):
+        if not 1 <= vertice_id <= self.num_vertices:
+            raise ValueError(f"Vértice {vertice_id} não encontrado.")
+
+    def verificar_face(self, face_id):
+        if not 1 <= face_id <= self.num_faces:
+            raise ValueError(f"Face {face_id} não encontrada.")
+
+    def verificar_aresta(self, v1, v2):
+        if self.indice_aresta(v1, v2) < 0:
+            raise ValueError(f"Aresta entre vértices {v1} e {v2} não encontrada.")
+
+    def vertices_da_face(self, face_id):
+        return np.asarray(self.face_indices[self.face_offsets[face_id - 1]:self.face_offsets[face_id]])
+
+    def faces_by_vertice(self, vertice_id):
+        self.verificar_vertice(vertice_id)
+        faces = set()
+        for inicio, fim in self.blocos(self.num_arestas):
+            direcao = np.asarray(self.arestas_direcao[inicio:fim])
+            incide = (direcao[:, 0] == vertice_id) | (direcao[:, 1] == vertice_id)
+            encontradas = np.asarray(self.arestas_faces[inicio:fim])[incide].ravel()
+            faces.update(int(f) for f in encontradas if f)
+        return faces
+
+    def arestas_by_vertice(self, vertice_id):
+        self.verificar_vertice(vertice_id)
+        arestas = set()
+        for inicio, fim in self.blocos(self.num_arestas):
+            direcao = np.asarray(self.arestas_direcao[inicio:fim])
+            incide = (direcao[:, 0] == vertice_id) | (direcao[:, 1] == vertice_id)
+            arestas.update((int(a), int(b)) for a, b in direcao[incide])
+        return arestas
+
+    def faces_by_aresta(self, v1, v2):
+        self.verificar_aresta(v1, v2)
+        return set(int(f) for f in self.arestas_faces[self.indice_aresta(v1, v2)] if f)
+
+    def arestas_by_face(self, face_id):
+        self.verificar_face(face_id)
+        indices = self.vertices_da_face(face_id)
+        arestas = set()
+        for v1, v2 in zip(indices, np.roll(indices, -1)):
+            start, end = self.arestas_direcao[self.indice_aresta(v1, v2)]
+            arestas.add((int(start), int(end)))
+        return arestas
+
+    def adjacent_faces(self, face_id):
+        self.verificar_face(face_id)
+        indices = self.vertices_da_face(face_id)
+        vizinhas = set()
+        for v1, v2 in zip(indices, np.roll(indices, -1)):
+            for f in self.arestas_faces[self.indice_aresta(v1, v2)]:
+                if f and f != face_id:
+                    vizinhas.add(int(f))
+        return vizinhas
+
+    def copiar_topologia(self, diretorio_destino):
+        """
+        Cria uma nova malha mapeada em `diretorio_destino` com a mesma topologia
+
+        Os arquivos de faces e arestas são copiados (não ligados), para que regravar a
+        malha de origem nunca altere a cópia. O arquivo de posições é criado vazio,
+        para ser preenchido por quem chamou (ver aplicar_transformacoes_mesh_mapeada).
+
+        Returns:
+            tuple: (nova_malha, posicoes) onde posicoes é o memmap gravável (N, 3)
+        """
+        import shutil
+
+        if os.path.realpath(diretorio_destino) == os.path.realpath(self.diretorio) or \
+                (os.path.exists(diretorio_destino) and os.path.samefile(diretorio_destino, self.diretorio)):
+            raise ValueError("O diretório de destino deve ser diferente do diretório da malha de origem.")
+
+        os.makedirs(diretorio_destino, exist_ok=True)
+        nova = WingedEdgeMeshMapeada(diretorio_destino, self.tamanho_bloco)
+        for nome in ARQUIVOS_TOPOLOGIA + (ARQUIVO_META,):
+            destino = nova.caminho(nome)
+            if os.path.exists(destino):
+                os.remove(destino)  # nunca escrever sobre um inode possivelmente compartilhado
+            shutil.copyfile(self.caminho(nome), destino)
+        posicoes = nova.novo_memmap(ARQUIVO_POSICOES, np.float64, (self.num_vertices, 3))
+        return nova, posicoes
@@ -0,0 +1,404 @@
+import os
+import numpy as np
+from collections import deque
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+from .subdivisao import arrays_da_mesh, topologia
+
+def adjacencia_faces(num_faces, topo):
+    """
+    Grafo de faces vizinhas por aresta, em CSR
+
+    Returns:
+        tuple: (offsets (F + 1,), vizinhas) com as vizinhas de cada face em ordem crescente
+    """
+    ordem = np.lexsort((topo['face'], topo['aresta']))
+    aresta, face = topo['aresta'][ordem], topo['face'][ordem]
+    # Faces consecutivas na mesma aresta são vizinhas
+    mesma = (aresta[1:] == aresta[:-1]) & (face[1:] != face[:-1])
+    a, b = face[:-1][mesma], face[1:][mesma]
+    origem = np.concatenate([a, b])
+    destino = np.concatenate([b, a])
+    pares = np.unique(origem * num_faces + destino)
+    origem, destino = pares // num_faces, pares % num_faces
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(origem, minlength=num_faces))])
+    return offsets, destino
+
+def faces_por_vertice(num_vertices, indices, face):
+    """Faces incidentes a cada vértice, em CSR (offsets (N + 1,), faces)"""
+    ordem = np.lexsort((face, indices))
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(indices, minlength=num_vertices))])
+    return offsets, face[ordem]
+
+def particionar_regioes(num_faces, adj_offsets, adj_vizinhas, num_particoes):
+    """
+    Particionamento por crescimento de regiões (busca em largura na adjacência)
+
+    Cada partição cresce a partir da face livre de menor índice até atingir
+    ceil(F / num_particoes) faces; se a componente conexa acabar antes disso, a
+    partição continua a partir da próxima face livre.
+
+    Returns:
+        numpy.ndarray: (F,) partição de cada face
+    """
+    alvo = -(-num_faces // num_particoes)
+    particao = np.full(num_faces, -1, dtype=np.int64)
+    proxima_livre = 0
+    for p in range(num_particoes):
+        tamanho = 0
+        fila = deque()
+        while tamanho < alvo:
+            if not fila:
+                while proxima_livre < num_faces and particao[proxima_livre] >= 0:
+                    proxima_livre += 1
+                if proxima_livre == num_faces:
+                    break
+                particao[proxima_livre] = p
+                fila.append(proxima_livre)
+                tamanho += 1
+                continue
+            f = fila.popleft()
+            for g in adj_vizinhas[adj_offsets[f]:adj_offsets[f + 1]]:
+                if tamanho >= alvo:
+                    break
+                if particao[g] < 0:
+                    particao[g] = p
+                    fila.append(g)
+                    tamanho += 1
+    return particao
+
+def particionar_espacial(centroides, num_particoes):
+    """
+    Particionamento espacial por bissecção recursiva dos centróides das faces
+
+    A cada passo o conjunto é dividido no eixo de maior extensão, na proporção do
+    número de partições de cada lado.
+
+    Returns:
+        numpy.ndarray: (F,) partição de cada face
+    """
+    particao = np.zeros(len(centroides), dtype=np.int64)
+
+    def dividir(faces, primeira, quantidade):
+        if quantidade == 1 or len(faces) == 0:
+            particao[faces] = primeira
+            return
+        pontos = centroides[faces]
+        eixo = np.argmax(pontos.max(axis=0) - pontos.min(axis=0))
+        ordenadas = faces[np.argsort(pontos[:, eixo], kind='stable')]
+        esquerda = quantidade // 2
+        corte = len(faces) * esquerda // quantidade
+        dividir(ordenadas[:corte], primeira, esquerda)
+        dividir(ordenadas[corte:], primeira + esquerda, quantidade - esquerda)
+
+    dividir(np.arange(len(centroides)), 0, num_particoes)
+    return particao
+
+def camadas_de_fantasmas(particao, p, vf_offsets, vf_faces, offsets, indices, camadas):
+    """
+    Faces fantasmas (halo) da partição p: faces de outras partições que compartilham
+    um vértice com a partição, repetido `camadas` vezes
+    """
+    dentro = particao == p
+    atuais = np.flatnonzero(dentro)
+    fantasmas = []
+    for _ in range(camadas):
+        vertices = np.unique(indices[cantos_das_faces(offsets, atuais)])
+        vizinhas = np.unique(vf_faces[cantos_das_faces(vf_offsets, vertices)])
+        novas = vizinhas[~dentro[vizinhas]]
+        if len(novas) == 0:
+            break
+        dentro[novas] = True
+        fantasmas.append(novas)
+        atuais = novas
+    return np.sort(np.concatenate(fantasmas)) if fantasmas else np.empty(0, dtype=np.int64)
+
+def cantos_das_faces(offsets, faces):
+    """Índices de todos os elementos CSR das linhas `faces`, concatenados em ordem"""
+    inicios, fins = offsets[faces], offsets[faces + 1]
+    tamanhos = fins - inicios
+    base = np.repeat(inicios - np.concatenate([[0], np.cumsum(tamanhos)[:-1]]), tamanhos)
+    return base + np.arange(tamanhos.sum())
+
+# Arrays da memória compartilhada em cada processo trabalhador do pool. Cada pool
+# pertence a um único executor; no processo principal os arrays ficam na instância.
+_compartilhado = {}
+_blocos_abertos = []
+
+def _anexar(descritores):
+    for nome, (bloco, forma, tipo) in descritores.items():
+        shm = SharedMemory(name=bloco)
+        _blocos_abertos.append(shm)
+        _compartilhado[nome] = np.ndarray(forma, dtype=tipo, buffer=shm.buf)
+
+def _normais_newell(d, faces):
+    # Normais (não normalizadas, |n| = 2 * área) de um conjunto de faces
+    cantos = cantos_das_faces(d['offsets'], faces)
+    v1 = d['posicoes'][d['indices'][cantos]]
+    v2 = d['posicoes'][d['indices'][d['proximo'][cantos]]]
+    inicios = np.concatenate([[0], np.cumsum(np.diff(d['offsets'])[faces])[:-1]])
+    return np.add.reduceat(np.cross(v1, v2), inicios, axis=0) if len(faces) else np.empty((0, 3))
+
+def _faces_da_particao(d, p):
+    return d['faces_part'][d['faces_part_offsets'][p]:d['faces_part_offsets'][p + 1]]
+
+def _vertices_da_particao(d, p):
+    return d['vertices_part'][d['vertices_part_offsets'][p]:d['vertices_part_offsets'][p + 1]]
+
+def _tarefa_transformacao(d, p, matriz):
+    vertices = _vertices_da_particao(d, p)
+    # Mesmo cálculo de aplicar_transformacao, linha a linha (sem BLAS, cujo
+    # arredondamento poderia variar com o tamanho do bloco de cada partição)
+    posicoes = d['posicoes'][vertices]
+    d['saida_vertices'][vertices] = (posicoes[:, np.newaxis, :] * matriz[np.newaxis, :3, :3]).sum(axis=2) + matriz[:3, 3]
+
+def _tarefa_atributos_faces(d, p):
+    faces = _faces_da_particao(d, p)
+    normais = _normais_newell(d, faces)
+    normas = np.linalg.norm(normais, axis=1)
+    cantos = cantos_das_faces(d['offsets'], faces)
+    grupos = np.repeat(np.arange(len(faces)), np.diff(d['offsets'])[faces])
+    soma = np.zeros((len(faces), 3))
+    np.add.at(soma, grupos, d['posicoes'][d['indices'][cantos]])
+    saida = d['saida_faces']
+    saida[faces, 0:3] = normais / np.maximum(normas, 1e-300)[:, np.newaxis]
+    saida[faces, 3] = 0.5 * normas
+    saida[faces, 4:7] = soma / np.diff(d['offsets'])[faces][:, np.newaxis]
+
+def _tarefa_normais_vertices(d, p):
+    # Faces próprias + halo cobrem todas as faces incidentes aos vértices da partição.
+    # Ordenadas por índice para que a soma de cada vértice siga sempre a mesma ordem,
+    # independente do particionamento.
+    fantasmas = d['fantasmas_part'][d['fantasmas_part_offsets'][p]:d['fantasmas_part_offsets'][p + 1]]
+    faces = np.sort(np.concatenate([_faces_da_particao(d, p), fantasmas]))
+    normais = _normais_newell(d, faces)
+    cantos = cantos_das_faces(d['offsets'], faces)
+    grupos = np.repeat(np.arange(len(faces)), np.diff(d['offsets'])[faces])
+    # Acumular apenas nos vértices locais (próprios + halo)
+    locais, inverso = np.unique(d['indices'][cantos], return_inverse=True)
+    acumulado = np.zeros((len(locais), 3))
+    np.add.at(acumulado, inverso, normais[grupos])
+    vertices = _vertices_da_particao(d, p)
+    # Vértices sem faces incidentes (linhas `v` não usadas) não aparecem em `locais`
+    # e recebem normal nula
+    linhas = np.searchsorted(locais, vertices)
+    usados = linhas < len(locais)
+    usados[usados] = locais[linhas[usados]] == vertices[usados]
+    resultado = np.zeros((len(vertices), 3))
+    resultado[usados] = acumulado[linhas[usados]]
+    normas = np.linalg.norm(resultado, axis=1)
+    d['saida_vertices'][vertices] = resultado / np.maximum(normas, 1e-300)[:, np.newaxis]
+
+def _tarefa_adjacent_faces(d, p):
+    # Converte para IDs de face o trecho CSR das faces da partição
+    faces = _faces_da_particao(d, p)
+    trechos = cantos_das_faces(d['adj_offsets'], faces)
+    d['saida_adj'][trechos] = d['face_ids'][d['adj_vizinhas'][trechos]]
+
+def _tarefa_faces_by_vertice(d, p):
+    vertices = _vertices_da_particao(d, p)
+    trechos = cantos_das_faces(d['vf_offsets'], vertices)
+    d['saida_vf'][trechos] = d['face_ids'][d['vf_faces'][trechos]]
+
+def _executar(tarefa, *args):
+    # Ponto de entrada no trabalhador (funções de módulo para funcionar com spawn)
+    return tarefa(_compartilhado, *args)
+
+class ResultadoCSR:
+    """
+    Resultado de consulta em lote: mapeamento somente leitura id -> set de IDs
+
+    Os dados ficam em arrays CSR (`chaves`, `offsets`, `valores`); os sets só são
+    criados quando um item é acessado.
+    """
+
+    def __init__(self, chaves, offsets, valores):
+        self.chaves = chaves
+        self.offsets = offsets
+        self.valores = valores
+
+    def __len__(self):
+        return len(self.chaves)
+
+    def __iter__(self):
+        return (int(c) for c in self.chaves)
+
+    def _linha(self, chave):
+        # `chaves` está em ordem crescente: busca binária em vez de um dict por item
+        i = int(np.searchsorted(self.chaves, chave))
+        if i == len(self.chaves) or self.chaves[i] != chave:
+            raise KeyError(chave)
+        return i
+
+    def __contains__(self, chave):
+        try:
+            self._linha(chave)
+            return True
+        except KeyError:
+            return False
+
+    def __getitem__(self, chave):
+        i = self._linha(chave)
+        return set(self.valores[self.offsets[i]:self.offsets[i + 1]].tolist())
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return ((c, self[c]) for c in self)
+
+class ExecutorParticionado:
+    """
+    Executa consultas e transformações de uma WingedEdgeMesh em paralelo
+
+    A malha é dividida em `num_particoes` partições de faces conectadas (crescimento
+    de regiões, metodo='regioes', ou bissecção espacial, metodo='espacial'), com
+    `camadas_fantasma` (>= 1) camadas de faces vizinhas por vértice como halo. Os arrays
+    da malha e os buffers de saída ficam em memória compartilhada e cada processo
+    do pool escreve apenas nos elementos da sua partição. Cada elemento é calculado
+    sempre na mesma ordem, então o resultado é idêntico (bit a bit) para qualquer
+    número de processos ou de partições.
+
+    Cada vértice pertence à partição de menor índice entre as faces que o contêm.
+    Resultados em array seguem a ordem crescente dos IDs de vértices/faces.
+    """
+
+    def __init__(self, mesh, num_particoes=None, processos=None, metodo='regioes', camadas_fantasma=1):
+        # normais_vertices precisa de ao menos uma camada de halo para vértices de fronteira
+        if camadas_fantasma < 1:
+            raise ValueError("camadas_fantasma deve ser pelo menos 1.")
+        self.processos = processos or os.cpu_count() or 1
+        self.num_particoes = num_particoes or self.processos
+        self.vertice_ids = np.array(sorted(mesh.vertices.keys()), dtype=np.int64)
+        self.face_ids = np.array(sorted(mesh.faces.keys()), dtype=np.int64)
+
+        posicoes, offsets, indices = arrays_da_mesh(mesh)
+        num_vertices, num_faces = len(posicoes), len(offsets) - 1
+        topo = topologia(num_vertices, offsets, indices)
+        adj_offsets, adj_vizinhas = adjacencia_faces(num_faces, topo)
+        vf_offsets, vf_faces = faces_por_vertice(num_vertices, indices, topo['face'])
+
+        if metodo == 'regioes':
+            self.particao = particionar_regioes(num_faces, adj_offsets, adj_vizinhas, self.num_particoes)
+        elif metodo == 'espacial':
+            centroides = np.add.reduceat(posicoes[indices], offsets[:-1], axis=0) / np.diff(offsets)[:, np.newaxis]
+            self.particao = particionar_espacial(centroides, self.num_particoes)
+        else:
+            raise ValueError(f"Método de particionamento '{metodo}' não reconhecido. Use: regioes, espacial")
+
+        # Dono de cada vértice: menor partição entre as faces incidentes (isolados -> 0)
+        dono = np.full(num_vertices, self.num_particoes, dtype=np.int64)
+        np.minimum.at(dono, indices, self.particao[topo['face']])
+        dono[dono == self.num_particoes] = 0
+
+        def agrupar(grupos, tamanho):
+            ordem = np.argsort(grupos, kind='stable')
+            return ordem, np.concatenate([[0], np.cumsum(np.bincount(grupos, minlength=tamanho))])
+
+        faces_part, faces_part_offsets = agrupar(self.particao, self.num_particoes)
+        vertices_part, vertices_part_offsets = agrupar(dono, self.num_particoes)
+        fantasmas = [camadas_de_fantasmas(self.particao, p, vf_offsets, vf_faces, offsets, indices, camadas_fantasma)
+                     for p in range(self.num_particoes)]
+        fantasmas_part_offsets = np.concatenate([[0], np.cumsum([len(f) for f in fantasmas])])
+
+        arrays = {
+            'posicoes': posicoes,
+            'offsets': offsets,
+            'indices': indices,
+            'proximo': topo['proximo'],
+            'adj_offsets': adj_offsets,
+            'adj_vizinhas': adj_vizinhas,
+            'vf_offsets': vf_offsets,
+            'vf_faces': vf_faces,
+            'faces_part': faces_part,
+            'faces_part_offsets': faces_part_offsets,
+            'vertices_part': vertices_part,
+            'vertices_part_offsets': vertices_part_offsets,
+            'fantasmas_part': np.concatenate(fantasmas).astype(np.int64),
+            'fantasmas_part_offsets': fantasmas_part_offsets,
+            'saida_vertices': np.zeros((num_vertices, 3)),
+            'saida_faces': np.zeros((num_faces, 7)),
+            'saida_adj': np.zeros(len(adj_vizinhas), dtype=np.int64),
+            'saida_vf': np.zeros(len(vf_faces), dtype=np.int64),
+            'face_ids': self.face_ids,
+        }
+        self.fantasmas = fantasmas
+        self._blocos = []
+        self._arrays = {}
+        descritores = {}
+        for nome, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+            self._arrays[nome] = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            self._arrays[nome][...] = array
+            self._blocos.append(shm)
+            descritores[nome] = (shm.name, array.shape, array.dtype.str)
+
+        self._pool = None
+        if self.processos > 1:
+            self._pool = get_context().Pool(self.processos, initializer=_anexar, initargs=(descritores,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def fechar(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        self._arrays = {}
+        for shm in self._blocos:
+            shm.close()
+            shm.unlink()
+        self._blocos = []
+
+    def _mapear(self, tarefa, *args):
+        # Executa a tarefa em todas as partições (com processos=1, no próprio processo)
+        if not self._blocos:
+            raise ValueError("Executor já foi fechado.")
+        chamadas = [(tarefa, p) + args for p in range(self.num_particoes)]
+        if self._pool is None:
+            for tarefa, *argumentos in chamadas:
+                tarefa(self._arrays, *argumentos)
+        else:
+            self._pool.starmap(_executar, chamadas)
+
+    def particoes(self):
+        """Lista de dicts com 'faces' e 'fantasmas' (IDs) de cada partição"""
+        return [{'faces': self.face_ids[self.particao == p], 'fantasmas': self.face_ids[self.fantasmas[p]]}
+                for p in range(self.num_particoes)]
+
+    def aplicar_transformacao(self, matriz_transformacao):
+        """Equivalente a aplicar_transformacao sobre todos os vértices: retorna (N, 3)"""
+        self._mapear(_tarefa_transformacao, np.asarray(matriz_transformacao, dtype=float))
+        return self._arrays['saida_vertices'].copy()
+
+    def atributos_faces(self):
+        """
+        Atributos por face, na ordem crescente dos IDs
+
+        Returns:
+            dict: 'normais' (F, 3) unitárias, 'areas' (F,) e 'centroides' (F, 3)
+        """
+        self._mapear(_tarefa_atributos_faces)
+        saida = self._arrays['saida_faces']
+        return {'normais': saida[:, 0:3].copy(), 'areas': saida[:, 3].copy(), 'centroides': saida[:, 4:7].copy()}
+
+    def normais_vertices(self):
+        """Normais unitárias por vértice (média das normais das faces ponderada pela área)"""
+        self._mapear(_tarefa_normais_vertices)
+        return self._arrays['saida_vertices'].copy()
+
+    def adjacent_faces_lote(self):
+        """adjacent_faces para todas as faces: ResultadoCSR face_id -> set de IDs"""
+        self._mapear(_tarefa_adjacent_faces)
+        return ResultadoCSR(self.face_ids, self._arrays['adj_offsets'].copy(), self._arrays['saida_adj'].copy())
+
+    def faces_by_vertice_lote(self):
+        """faces_by_vertice para todos os vértices: ResultadoCSR vertice_id -> set de IDs"""
+        self._mapear(_tarefa_faces_by_vertice)
+        return ResultadoCSR(self.vertice_ids, self._arrays['vf_offsets'].copy(), self._arrays['saida_vf'].copy())
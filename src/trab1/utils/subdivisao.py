@@ -0,0 +1,224 @@
+import numpy as np
+
+from .estrutura import WingedEdgeMesh, Vertice
+
+def arrays_da_mesh(mesh):
+    """
+    Extrai posições e faces (formato CSR) de uma WingedEdgeMesh
+
+    Returns:
+        tuple: (posicoes (N, 3), offsets (F + 1,), indices (base 0) dos vértices das faces)
+    """
+    vertice_ids = np.array(sorted(mesh.vertices.keys()), dtype=np.int64)
+    posicoes = np.array([mesh.vertices[v_id].position for v_id in vertice_ids],
+                        dtype=np.float64).reshape(-1, 3)
+    faces = [mesh.faces[f_id].vertice_indices for f_id in sorted(mesh.faces.keys())]
+    tamanhos = np.array([len(f) for f in faces], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(tamanhos)])
+    indices = np.array([i for f in faces for i in f], dtype=np.int64)
+    return posicoes, offsets, np.searchsorted(vertice_ids, indices)
+
+def topologia(num_vertices, offsets, indices):
+    """
+    Adjacência vetorizada reconstruída das listas de vértices das faces (CSR)
+
+    Não usa mesh.arestas nem os ponteiros winged-edge: as arestas são obtidas de
+    forma vetorizada (np.unique) a partir dos pares de vértices consecutivos.
+
+    Returns:
+        dict:
+            - 'face': face de cada canto (meia-aresta v_i -> v_i+1)
+            - 'proximo'/'anterior': canto seguinte/anterior na mesma face
+            - 'aresta': aresta (índice único) de cada canto
+            - 'arestas': (E, 2) vértices de cada aresta (min, max)
+            - 'faces_por_aresta': (E,) número de faces que usam cada aresta
+    """
+    tamanhos = np.diff(offsets)
+    face = np.repeat(np.arange(len(tamanhos)), tamanhos)
+    cantos = np.arange(len(indices))
+
+    proximo = cantos + 1
+    proximo[offsets[1:] - 1] = offsets[:-1]
+    anterior = cantos - 1
+    anterior[offsets[:-1]] = offsets[1:] - 1
+
+    v1, v2 = indices, indices[proximo]
+    chaves = np.minimum(v1, v2) * num_vertices + np.maximum(v1, v2)
+    chaves_unicas, aresta = np.unique(chaves, return_inverse=True)
+    arestas = np.stack([chaves_unicas // num_vertices, chaves_unicas % num_vertices], axis=1)
+
+    return {
+        'face': face,
+        'proximo': proximo,
+        'anterior': anterior,
+        'aresta': aresta,
+        'arestas': arestas,
+        'faces_por_aresta': np.bincount(aresta, minlength=len(arestas))
+    }
+
+def media_por_grupo(grupos, valores, num_grupos):
+    """Média de `valores` (n, 3) agrupados por `grupos` (n,); grupos vazios ficam zerados"""
+    soma = np.zeros((num_grupos, 3))
+    np.add.at(soma, grupos, valores)
+    contagem = np.bincount(grupos, minlength=num_grupos)
+    return soma / np.maximum(contagem, 1)[:, np.newaxis], contagem
+
+def regra_de_borda(posicoes, arestas, borda):
+    """
+    Posições 3/4 P + 1/8 (a + b) para vértices de borda e máscara desses vértices
+    """
+    n = len(posicoes)
+    a, b = arestas[borda, 0], arestas[borda, 1]
+    soma_vizinhos = np.zeros((n, 3))
+    np.add.at(soma_vizinhos, a, posicoes[b])
+    np.add.at(soma_vizinhos, b, posicoes[a])
+    num_bordas = np.bincount(a, minlength=n) + np.bincount(b, minlength=n)
+    na_borda = num_bordas == 2
+    return 0.75 * posicoes + 0.125 * soma_vizinhos, na_borda
+
+def passo_catmull_clark(posicoes, offsets, indices):
+    """
+    Um nível de Catmull-Clark sobre arrays (faces poligonais quaisquer)
+
+    Os novos vértices são numerados como: vértices originais, pontos de aresta
+    (na ordem das arestas) e pontos de face. Cada canto de face gera um quadrilátero
+    (v_i, aresta_i, face, aresta_i-1), preservando a orientação da face original.
+    """
+    n = len(posicoes)
+    num_faces = len(offsets) - 1
+    topo = topologia(n, offsets, indices)
+    arestas, aresta = topo['arestas'], topo['aresta']
+    num_arestas = len(arestas)
+
+    # Pontos de face: média dos vértices
+    pontos_face, _ = media_por_grupo(topo['face'], posicoes[indices], num_faces)
+
+    # Pontos de aresta: média dos extremos e dos pontos de face vizinhos (ou ponto médio na borda)
+    medios = 0.5 * (posicoes[arestas[:, 0]] + posicoes[arestas[:, 1]])
+    media_faces, faces_por_aresta = media_por_grupo(aresta, pontos_face[topo['face']], num_arestas)
+    interna = faces_por_aresta == 2
+    pontos_aresta = medios.copy()
+    pontos_aresta[interna] = 0.5 * (medios[interna] + media_faces[interna])
+
+    # Vértices originais: (Q + 2R + (n - 3) P) / n
+    q, valencia = media_por_grupo(indices, pontos_face[topo['face']], n)
+    extremos = arestas.ravel()
+    r, _ = media_por_grupo(extremos, np.repeat(medios, 2, axis=0), n)
+    num_arestas_vertice = np.bincount(extremos, minlength=n)
+    k = np.maximum(num_arestas_vertice, 1)[:, np.newaxis].astype(float)
+    novos_vertices = (q + 2.0 * r + (k - 3.0) * posicoes) / k
+    novos_vertices[valencia == 0] = posicoes[valencia == 0]
+
+    borda, na_borda = regra_de_borda(posicoes, arestas, faces_por_aresta == 1)
+    novos_vertices[na_borda] = borda[na_borda]
+
+    # Topologia do nível seguinte, derivada diretamente dos cantos do nível atual
+    ponto_aresta = n + aresta
+    ponto_face = n + num_arestas + topo['face']
+    novos_indices = np.stack([indices, ponto_aresta, ponto_face,
+                              ponto_aresta[topo['anterior']]], axis=1).ravel()
+    novos_offsets = np.arange(0, len(novos_indices) + 1, 4)
+
+    return np.concatenate([novos_vertices, pontos_aresta, pontos_face]), novos_offsets, novos_indices
+
+def passo_loop(posicoes, offsets, indices):
+    """
+    Um nível de subdivisão de Loop sobre arrays (somente triângulos)
+
+    Os novos vértices são numerados como: vértices originais e pontos de aresta.
+    Cada triângulo (a, b, c) gera quatro: (a, ab, ca), (b, bc, ab), (c, ca, bc), (ab, bc, ca).
+    """
+    n = len(posicoes)
+    topo = topologia(n, offsets, indices)
+    arestas, aresta = topo['arestas'], topo['aresta']
+    num_arestas = len(arestas)
+    faces_por_aresta = topo['faces_por_aresta']
+
+    # Pontos de aresta: 3/8 dos extremos + 1/8 dos vértices opostos (ponto médio na borda)
+    opostos = np.zeros((num_arestas, 3))
+    np.add.at(opostos, aresta, posicoes[indices[topo['anterior']]])
+    medios = 0.5 * (posicoes[arestas[:, 0]] + posicoes[arestas[:, 1]])
+    interna = faces_por_aresta == 2
+    pontos_aresta = medios.copy()
+    pontos_aresta[interna] = 0.75 * medios[interna] + 0.125 * opostos[interna]
+
+    # Vértices originais: (1 - k beta) P + beta * soma dos vizinhos (pesos de Loop)
+    extremos = arestas.ravel()
+    vizinhos = arestas[:, ::-1].ravel()
+    soma_vizinhos = np.zeros((n, 3))
+    np.add.at(soma_vizinhos, extremos, posicoes[vizinhos])
+    k = np.bincount(extremos, minlength=n).astype(float)
+    k_seguro = np.maximum(k, 1.0)
+    beta = (0.625 - (0.375 + 0.25 * np.cos(2.0 * np.pi / k_seguro)) ** 2) / k_seguro
+    beta[k == 0] = 0.0
+    novos_vertices = (1.0 - k * beta)[:, np.newaxis] * posicoes + beta[:, np.newaxis] * soma_vizinhos
+
+    borda, na_borda = regra_de_borda(posicoes, arestas, faces_por_aresta == 1)
+    novos_vertices[na_borda] = borda[na_borda]
+
+    # Canto i de cada triângulo: ponto da aresta que sai dele e da que chega nele
+    cantos = indices.reshape(-1, 3)
+    sai = (n + aresta).reshape(-1, 3)
+    chega = (n + aresta[topo['anterior']]).reshape(-1, 3)
+    novos_indices = np.concatenate([
+        np.stack([cantos, sai, chega], axis=2).reshape(-1, 3),
+        sai
+    ])
+    # Reordenar para que os 4 filhos de cada triângulo fiquem consecutivos
+    num_triangulos = len(cantos)
+    ordem = np.concatenate([
+        np.arange(3 * num_triangulos).reshape(-1, 3),
+        3 * num_triangulos + np.arange(num_triangulos)[:, np.newaxis]
+    ], axis=1).ravel()
+    novos_indices = novos_indices[ordem].ravel()
+    novos_offsets = np.arange(0, len(novos_indices) + 1, 3)
+
+    return np.concatenate([novos_vertices, pontos_aresta]), novos_offsets, novos_indices
+
+def montar_mesh(posicoes, offsets, indices):
+    """Cria uma WingedEdgeMesh (IDs base 1) a partir de posições e faces em CSR"""
+    mesh = WingedEdgeMesh()
+    for i, posicao in enumerate(posicoes.tolist(), 1):
+        mesh.vertices[i] = Vertice(i, tuple(posicao))
+    ids = (indices + 1).tolist()
+    for f in range(len(offsets) - 1):
+        mesh.add_face(f + 1, ids[offsets[f]:offsets[f + 1]])
+    return mesh
+
+def subdividir_catmull_clark(mesh, niveis=1):
+    """
+    Subdivisão de Catmull-Clark de uma WingedEdgeMesh poligonal
+
+    A adjacência é reconstruída das listas de vértices das faces (ver topologia) e
+    cada nível é calculado de forma vetorizada sobre arrays; a malha winged-edge
+    resultante é montada uma única vez ao final.
+
+    Args:
+        mesh: Objeto WingedEdgeMesh
+        niveis: Número de níveis de subdivisão
+
+    Returns:
+        WingedEdgeMesh: Nova malha composta apenas por quadriláteros
+    """
+    posicoes, offsets, indices = arrays_da_mesh(mesh)
+    for _ in range(niveis):
+        posicoes, offsets, indices = passo_catmull_clark(posicoes, offsets, indices)
+    return montar_mesh(posicoes, offsets, indices)
+
+def subdividir_loop(mesh, niveis=1):
+    """
+    Subdivisão de Loop de uma WingedEdgeMesh triangular
+
+    Args:
+        mesh: Objeto WingedEdgeMesh composto apenas por triângulos
+        niveis: Número de níveis de subdivisão
+
+    Returns:
+        WingedEdgeMesh: Nova malha triangular
+    """
+    posicoes, offsets, indices = arrays_da_mesh(mesh)
+    if np.any(np.diff(offsets) != 3):
+        raise ValueError("Subdivisão de Loop requer uma malha apenas com triângulos.")
+    for _ in range(niveis):
+        posicoes, offsets, indices = passo_loop(posicoes, offsets, indices)
+    return montar_mesh(posicoes, offsets, indices)
@@ -0,0 +1,177 @@
+import numpy as np
+
+EPSILON = 1e-12
+
+def triangular_mesh(mesh):
+    """
+    Triangula todas as faces de uma WingedEdgeMesh e monta buffers contíguos
+
+    Faces convexas são trianguladas em leque (vetorizado por grupo de faces com o
+    mesmo número de vértices); faces côncavas usam ear clipping no plano da face.
+    Faces com menos de 3 vértices são ignoradas.
+
+    Args:
+        mesh: Objeto WingedEdgeMesh
+
+    Returns:
+        dict:
+            - 'vertices': float32 (N, 3), posições na ordem crescente dos IDs dos vértices
+            - 'indices': uint32 (T, 3), índices (base 0) no buffer de vértices
+            - 'faces': uint32 (T,), ID da face de origem de cada triângulo
+            - 'vertice_ids': int64 (N,), ID do vértice de cada linha do buffer
+    """
+    vertice_ids = np.array(sorted(mesh.vertices.keys()), dtype=np.int64)
+    posicoes = np.array([mesh.vertices[v_id].position for v_id in vertice_ids],
+                        dtype=np.float64).reshape(-1, 3)
+
+    # Agrupar faces pelo número de vértices para processar cada grupo em lote
+    grupos = {}
+    for face_id, face in mesh.faces.items():
+        n = len(face.vertice_indices)
+        if n < 3:
+            continue
+        ids, indices = grupos.setdefault(n, ([], []))
+        ids.append(face_id)
+        indices.append(face.vertice_indices)
+
+    partes_indices = []
+    partes_faces = []
+    for n, (ids, indices) in sorted(grupos.items()):
+        ids = np.array(ids, dtype=np.int64)
+        # IDs do .obj -> linhas do buffer de vértices
+        poligonos = np.searchsorted(vertice_ids, np.array(indices, dtype=np.int64))
+        convexas = faces_convexas(posicoes[poligonos])
+
+        if convexas.any():
+            triangulos = triangulacao_leque(poligonos[convexas])
+            partes_indices.append(triangulos.reshape(-1, 3))
+            partes_faces.append(np.repeat(ids[convexas], n - 2))
+
+        for face_id, poligono in zip(ids[~convexas], poligonos[~convexas]):
+            triangulos = ear_clipping(posicoes[poligono])
+            partes_indices.append(poligono[triangulos])
+            partes_faces.append(np.full(len(triangulos), face_id))
+
+    if partes_indices:
+        indices = np.concatenate(partes_indices)
+        faces = np.concatenate(partes_faces)
+        # Ordem estável por face de origem, independente do agrupamento
+        ordem = np.argsort(faces, kind='stable')
+        indices, faces = indices[ordem], faces[ordem]
+    else:
+        indices = np.empty((0, 3), dtype=np.int64)
+        faces = np.empty(0, dtype=np.int64)
+
+    return {
+        'vertices': np.ascontiguousarray(posicoes, dtype=np.float32),
+        'indices': np.ascontiguousarray(indices, dtype=np.uint32),
+        'faces': np.ascontiguousarray(faces, dtype=np.uint32),
+        'vertice_ids': vertice_ids
+    }
+
+def normal_newell(poligonos):
+    """Normal (não normalizada) de um lote de polígonos (F, n, 3) pelo método de Newell"""
+    proximos = np.roll(poligonos, -1, axis=1)
+    return np.cross(poligonos, proximos).sum(axis=1)
+
+def faces_convexas(poligonos):
+    """
+    Verifica a convexidade de um lote de polígonos (F, n, 3) com o mesmo número de vértices
+
+    Um polígono é convexo se o produto vetorial de cada par de arestas consecutivas
+    aponta para o mesmo lado da normal da face.
+    """
+    if poligonos.shape[1] == 3:
+        return np.ones(len(poligonos), dtype=bool)
+
+    normais = normal_newell(poligonos)
+    arestas = np.roll(poligonos, -1, axis=1) - poligonos
+    curvas = np.cross(arestas, np.roll(arestas, -1, axis=1))
+    orientacao = np.einsum('fij,fj->fi', curvas, normais)
+    escala = np.einsum('fj,fj->f', normais, normais)[:, np.newaxis]
+    return np.all(orientacao >= -EPSILON * escala, axis=1)
+
+def triangulacao_leque(poligonos):
+    """
+    Triangulação em leque de um lote de polígonos convexos (F, n)
+
+    Returns:
+        numpy.ndarray: (F, n-2, 3) com os índices de cada triângulo
+    """
+    n = poligonos.shape[1]
+    i = np.arange(1, n - 1)
+    return np.stack([
+        np.broadcast_to(poligonos[:, :1], (len(poligonos), n - 2)),
+        poligonos[:, i],
+        poligonos[:, i + 1]
+    ], axis=2)
+
+def ear_clipping(posicoes):
+    """
+    Triangula um polígono simples (possivelmente côncavo) por ear clipping
+
+    Args:
+        posicoes: Array (n, 3) com os vértices do polígono em ordem
+
+    Returns:
+        numpy.ndarray: (n-2, 3) com índices locais (0..n-1) dos triângulos
+    """
+    n = len(posicoes)
+    normal = normal_newell(posicoes[np.newaxis])[0]
+
+    # Projetar no plano da face, com orientação anti-horária em relação à normal
+    eixo_u = posicoes[1] - posicoes[0]
+    eixo_u = eixo_u - normal * np.dot(eixo_u, normal) / max(np.dot(normal, normal), EPSILON)
+    eixo_v = np.cross(normal, eixo_u)
+    pontos = np.stack([posicoes @ eixo_u, posicoes @ eixo_v], axis=1)
+
+    def area2(a, b, c):
+        return (pontos[b, 0] - pontos[a, 0]) * (pontos[c, 1] - pontos[a, 1]) - \
+               (pontos[b, 1] - pontos[a, 1]) * (pontos[c, 0] - pontos[a, 0])
+
+    def dentro(p, a, b, c):
+        return area2(a, b, p) >= 0 and area2(b, c, p) >= 0 and area2(c, a, p) >= 0
+
+    restantes = list(range(n))
+    triangulos = []
+    while len(restantes) > 3:
+        m = len(restantes)
+        for i in range(m):
+            a, b, c = restantes[i - 1], restantes[i], restantes[(i + 1) % m]
+            if area2(a, b, c) <= 0:
+                continue  # vértice reflexo (ou degenerado) não é orelha
+            if any(dentro(p, a, b, c) for p in restantes if p not in (a, b, c)):
+                continue
+            triangulos.append((a, b, c))
+            del restantes[i]
+            break
+        else:
+            # Polígono degenerado: nenhuma orelha encontrada, completar em leque
+            triangulos.extend((restantes[0], restantes[j], restantes[j + 1])
+                              for j in range(1, len(restantes) - 1))
+            restantes = []
+    if len(restantes) == 3:
+        triangulos.append(tuple(restantes))
+
+    return np.array(triangulos, dtype=np.int64).reshape(-1, 3)
+
+def salvar_triangulacao_binaria(triangulacao, prefixo):
+    """
+    Exporta os buffers da triangulação como binários brutos (little-endian)
+
+    Gera os arquivos:
+        - <prefixo>_vertices.f32: float32 x, y, z por vértice
+        - <prefixo>_indices.u32: uint32 com 3 índices por triângulo
+        - <prefixo>_faces.u32: uint32 com a face de origem de cada triângulo
+
+    Returns:
+        list: Nomes dos arquivos gerados
+    """
+    arquivos = []
+    for chave, extensao, tipo in (('vertices', 'f32', '<f4'),
+                                  ('indices', 'u32', '<u4'),
+                                  ('faces', 'u32', '<u4')):
+        nome_arquivo = f"{prefixo}_{chave}.{extensao}"
+        triangulacao[chave].astype(tipo, copy=False).tofile(nome_arquivo)
+        arquivos.append(nome_arquivo)
+    return arquivos
@@ -0,0 +1,204 @@
+import os
+import sys
+import tempfile
+import numpy as np
+from utils.estrutura import WingedEdgeMesh
+from utils.estrutura_mapeada import WingedEdgeMeshMapeada
+from utils.particionamento import ExecutorParticionado
+from utils.triangulacao import ear_clipping, normal_newell
+from utils.subdivisao import subdividir_catmull_clark, subdividir_loop
+from utils.estrutura import Vertice
+from transformacoes import (aplicar_transformacao, aplicar_transformacoes_mesh_mapeada,
+                            criar_matriz_transformacao)
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+ARQUIVOS = ['cube.obj', 'tree.obj', 'flash.obj']
+TRANSFORMACOES = [('rotacao_x', 30), ('cisalhamento', 'xy', 0.3), ('translacao', 1, 2, 3)]
+
+def carregar(nome):
+    mesh = WingedEdgeMesh()
+    mesh.load_obj(os.path.join(PASTA, nome))
+    return mesh
+
+def comparar_consultas(mesh, outra):
+    # Todas as consultas de `outra` devem coincidir com as da WingedEdgeMesh em memória
+    for v in mesh.vertices:
+        assert mesh.faces_by_vertice(v) == outra.faces_by_vertice(v), f"faces_by_vertice({v})"
+        assert mesh.arestas_by_vertice(v) == outra.arestas_by_vertice(v), f"arestas_by_vertice({v})"
+    for f in mesh.faces:
+        assert mesh.arestas_by_face(f) == outra.arestas_by_face(f), f"arestas_by_face({f})"
+        assert mesh.adjacent_faces(f) == outra.adjacent_faces(f), f"adjacent_faces({f})"
+    for v1, v2 in mesh.arestas:
+        assert mesh.faces_by_aresta(v1, v2) == outra.faces_by_aresta(v2, v1), f"faces_by_aresta({v1}, {v2})"
+
+def area_triangulos(vertices, triangulos):
+    a, b, c = (vertices[triangulos[:, i]].astype(np.float64) for i in range(3))
+    return 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1)
+
+def verificar_triangulacao():
+    """Triangulação: T = soma(n - 2) e área de cada face plana preservada"""
+    for nome in ARQUIVOS:
+        mesh = carregar(nome)
+        triangulacao = mesh.triangular()
+        assert len(triangulacao['indices']) == sum(len(f.vertice_indices) - 2 for f in mesh.faces.values())
+        areas = np.bincount(triangulacao['faces'], weights=area_triangulos(triangulacao['vertices'], triangulacao['indices']),
+                            minlength=max(mesh.faces) + 1)
+        for f_id, face in mesh.faces.items():
+            pontos = np.array([mesh.vertices[i].position for i in face.vertice_indices], dtype=np.float64)
+            normal = normal_newell(pontos[np.newaxis])[0]
+            norma = np.linalg.norm(normal)
+            # Faces não planas (ex.: 4 quads de flash.obj) não têm área de referência única
+            if norma == 0 or np.abs((pontos - pontos[0]) @ (normal / norma)).max() > 1e-6 * max(np.ptp(pontos), 1.0):
+                continue
+            assert np.isclose(areas[f_id], 0.5 * norma, rtol=1e-4), f"{nome}: área da face {f_id}"
+        print(f"✓ Triangulação: {nome}")
+
+    # Polígono côncavo em L (área 3) passa pelo ear clipping
+    l = np.array([(0, 0, 0), (2, 0, 0), (2, 1, 0), (1, 1, 0), (1, 2, 0), (0, 2, 0)], dtype=np.float64)
+    triangulos = ear_clipping(l)
+    assert len(triangulos) == 4 and np.isclose(area_triangulos(l, triangulos).sum(), 3.0)
+    print("✓ Triangulação: ear clipping em L côncavo")
+
+def malha(pontos, faces):
+    mesh = WingedEdgeMesh()
+    for i, p in enumerate(pontos, 1):
+        mesh.vertices[i] = Vertice(i, tuple(map(float, p)))
+    for i, f in enumerate(faces, 1):
+        mesh.add_face(i, f)
+    return mesh
+
+def fechada(mesh):
+    return all(a.left_face is not None and a.right_face is not None for a in mesh.arestas.values())
+
+def verificar_subdivisao():
+    """Subdivisão: contagens V/F/E, malhas fechadas continuam fechadas e posições conhecidas"""
+    # Catmull-Clark: V' = V + E + F, F' = soma(n), E' = 2E + soma(n)
+    cubo = malha([(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)],
+                 [[1, 2, 4, 3], [5, 7, 8, 6], [1, 5, 6, 2], [3, 4, 8, 7], [1, 3, 7, 5], [2, 6, 8, 4]])
+    for entrada in (cubo, carregar('cube.obj')):
+        v, f, e = len(entrada.vertices), len(entrada.faces), len(entrada.arestas)
+        cantos = sum(len(face.vertice_indices) for face in entrada.faces.values())
+        sub = subdividir_catmull_clark(entrada)
+        assert (len(sub.vertices), len(sub.faces), len(sub.arestas)) == (v + e + f, cantos, 2 * e + cantos)
+        assert fechada(sub)
+    # Canto do cubo [-1, 1]^3 após um nível: (-5/9, -5/9, -5/9)
+    assert np.allclose(subdividir_catmull_clark(cubo).vertices[1].position, [-5 / 9] * 3)
+    assert fechada(subdividir_catmull_clark(cubo, 3))
+    print("✓ Subdivisão: Catmull-Clark")
+
+    # Loop: V' = V + E, F' = 4F, E' = 2E + 3F
+    for entrada in (carregar('cube.obj'), malha([(1, 1, 1), (1, -1, -1), (-1, 1, -1), (-1, -1, 1)],
+                                                [[1, 2, 3], [1, 4, 2], [1, 3, 4], [2, 4, 3]])):
+        v, f, e = len(entrada.vertices), len(entrada.faces), len(entrada.arestas)
+        sub = subdividir_loop(entrada)
+        assert (len(sub.vertices), len(sub.faces), len(sub.arestas)) == (v + e, 4 * f, 2 * e + 3 * f)
+        assert fechada(sub) and fechada(subdividir_loop(entrada, 3))
+    # Regra de borda em um triângulo isolado: 3/4 P + 1/8 (a + b); ponto de aresta = ponto médio
+    triangulo = subdividir_loop(malha([(0, 0, 0), (8, 0, 0), (0, 8, 0)], [[1, 2, 3]]))
+    assert np.allclose(triangulo.vertices[1].position, [1, 1, 0])
+    assert np.allclose(sorted(triangulo.vertices[i].position for i in (4, 5, 6)),
+                       sorted([(4, 0, 0), (0, 4, 0), (4, 4, 0)]))
+    print("✓ Subdivisão: Loop")
+
+def verificar_mapeada():
+    """WingedEdgeMeshMapeada equivale à WingedEdgeMesh para qualquer tamanho_bloco"""
+    matriz = criar_matriz_transformacao(TRANSFORMACOES)
+    with tempfile.TemporaryDirectory() as tmp:
+        for nome in ARQUIVOS:
+            mesh = carregar(nome)
+            esperado = aplicar_transformacao([mesh.vertices[i].position for i in sorted(mesh.vertices)], matriz)
+            for tamanho_bloco in (7, 64, 1 << 20):
+                diretorio = os.path.join(tmp, f"{nome}_{tamanho_bloco}")
+                mapeada = WingedEdgeMeshMapeada(diretorio, tamanho_bloco).load_obj(os.path.join(PASTA, nome))
+                assert mapeada.num_arestas == len(mesh.arestas)
+                comparar_consultas(mesh, mapeada)
+                transformada, _ = aplicar_transformacoes_mesh_mapeada(mapeada, TRANSFORMACOES, diretorio + '_t')
+                assert np.allclose(transformada.posicoes, esperado)
+            print(f"✓ WingedEdgeMeshMapeada: {nome}")
+
+        # Regravar a malha de origem não pode alterar uma cópia transformada
+        origem = os.path.join(tmp, 'origem')
+        mapeada = WingedEdgeMeshMapeada(origem).load_obj(os.path.join(PASTA, 'tree.obj'))
+        aplicar_transformacoes_mesh_mapeada(mapeada, TRANSFORMACOES, origem + '_t')
+        WingedEdgeMeshMapeada(origem).load_obj(os.path.join(PASTA, 'cube.obj'))
+        comparar_consultas(carregar('tree.obj'), WingedEdgeMeshMapeada(origem + '_t').abrir())
+
+        # Destino igual à origem é recusado sem alterar a malha
+        try:
+            aplicar_transformacoes_mesh_mapeada(mapeada, TRANSFORMACOES, origem)
+            raise AssertionError("destino igual à origem deveria ser recusado")
+        except ValueError:
+            pass
+        comparar_consultas(carregar('cube.obj'), WingedEdgeMeshMapeada(origem).abrir())
+        print("✓ WingedEdgeMeshMapeada: cópias independentes da origem")
+
+def resultados_executor(executor, matriz):
+    atributos = executor.atributos_faces()
+    return [executor.aplicar_transformacao(matriz), atributos['normais'], atributos['areas'],
+            atributos['centroides'], executor.normais_vertices()]
+
+def verificar_particionamento():
+    """ExecutorParticionado equivale aos métodos seriais e é idêntico para 1, 2 ou 4 processos"""
+    matriz = criar_matriz_transformacao(TRANSFORMACOES)
+    for nome in ARQUIVOS:
+        mesh = carregar(nome)
+        esperado = aplicar_transformacao([mesh.vertices[i].position for i in sorted(mesh.vertices)], matriz)
+        for metodo in ('regioes', 'espacial'):
+            referencia = None
+            for processos in (1, 2, 4):
+                with ExecutorParticionado(mesh, processos=processos, metodo=metodo) as executor:
+                    resultados = resultados_executor(executor, matriz)
+                    assert np.allclose(resultados[0], esperado)
+                    adjacentes = executor.adjacent_faces_lote()
+                    assert all(adjacentes[f] == mesh.adjacent_faces(f) for f in mesh.faces)
+                    por_vertice = executor.faces_by_vertice_lote()
+                    assert all(por_vertice[v] == mesh.faces_by_vertice(v) for v in mesh.vertices)
+                referencia = referencia or resultados
+                for atual, ref in zip(resultados, referencia):
+                    assert np.array_equal(atual, ref), f"{nome} {metodo}: processos={processos} difere de processos=1"
+        print(f"✓ ExecutorParticionado: {nome}")
+
+    # Dois executores vivos ao mesmo tempo não interferem entre si
+    cube, tree = carregar('cube.obj'), carregar('tree.obj')
+    with ExecutorParticionado(cube, processos=1) as ex1, ExecutorParticionado(tree, processos=2) as ex2:
+        assert ex1.aplicar_transformacao(matriz).shape == (len(cube.vertices), 3)
+        ex2.fechar()
+        assert ex1.normais_vertices().shape == (len(cube.vertices), 3)
+    print("✓ ExecutorParticionado: executores independentes")
+
+    # Vértices sem faces (linhas `v` não usadas) recebem normal nula, sem afetar os demais
+    with ExecutorParticionado(cube, processos=1) as executor:
+        referencia = executor.normais_vertices()
+    for v_id in (max(cube.vertices) + 1, 0):
+        mesh = carregar('cube.obj')
+        mesh.vertices[v_id] = Vertice(v_id, (5.0, 5.0, 5.0))
+        linha = sorted(mesh.vertices).index(v_id)
+        for processos in (1, 2):
+            with ExecutorParticionado(mesh, num_particoes=3, processos=processos) as executor:
+                normais = executor.normais_vertices()
+                assert np.array_equal(normais[linha], np.zeros(3))
+                assert np.allclose(np.delete(normais, linha, axis=0), referencia)
+                assert executor.faces_by_vertice_lote()[v_id] == set()
+    print("✓ ExecutorParticionado: vértices sem faces")
+
+    # Sem halo as normais dos vértices de fronteira ficariam erradas
+    try:
+        ExecutorParticionado(cube, processos=1, camadas_fantasma=0)
+        raise AssertionError("camadas_fantasma=0 deveria ser recusado")
+    except ValueError:
+        pass
+
+def main():
+    """
+    Compara as estruturas alternativas com a WingedEdgeMesh em cube, tree e flash
+
+    Uso: python verificar_estruturas.py
+    """
+    verificar_triangulacao()
+    verificar_subdivisao()
+    verificar_mapeada()
+    verificar_particionamento()
+    print("Todas as verificações passaram.")
+
+if __name__ == "__main__":
+    sys.exit(main())